@@ -59,11 +59,14 @@ export interface SidecarBookResult {
   site_id: string | null;
   confirmation_number: string | null;
   error: string | null;
+  // Checkout may have gone through; check the account before rebooking
+  outcome_unknown?: boolean;
 }
 
 export interface SidecarLoginResult {
   success: boolean;
   session_token: string | null;
+  session_kind?: "bearer" | "cookie" | null;
   error: string | null;
 }
 
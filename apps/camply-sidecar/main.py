@@ -3,21 +3,84 @@ Camply Sidecar — FastAPI wrapper over camply for campsite search, availability
 and booking execution on GoingToCamp platforms (Ontario Parks, Parks Canada, BC Parks, etc.)
 """
 
-from fastapi import FastAPI
+import logging
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from routes.search import router as search_router
 from routes.availability import router as availability_router
 from routes.booking import router as booking_router
 from patches.rec_areas_override import register_ontario_parks
+from patches.http_cache import install_http_cache
+from services.admission import (
+    CLASS_HEADER,
+    QUEUE_TIME_HEADER,
+    AdmissionRejected,
+    admission_controller,
+    classify,
+)
+from services.http_client import close_shared_transport
+from services.responses import ORJSONResponse
+
+logger = logging.getLogger(__name__)
 
 # Register Ontario Parks as a GoingToCamp recreation area on startup
 register_ontario_parks()
 
+# Serve camply's Recreation.gov metadata requests from the on-disk cache
+install_http_cache()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await close_shared_transport()
+
+
 app = FastAPI(
     title="Camply Sidecar",
     description="Campsite search, availability, and booking via camply",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan,
 )
 
+
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    """
+    Gate requests through the priority admission controller so bookings never
+    queue behind scanner traffic. Queue time is reported per request so callers
+    can back off.
+    """
+    request_class = classify(request.url.path)
+    if request_class is None:
+        return await call_next(request)
+
+    class_name = request_class.name.lower()
+    try:
+        queued_for = await admission_controller.acquire(request_class)
+    except AdmissionRejected as e:
+        logger.warning(f"Shed {class_name} request after {e.queued_for * 1000:.0f}ms: {e}")
+        return ORJSONResponse(
+            status_code=503,
+            content={"detail": f"Sidecar overloaded: {e}"},
+            headers={
+                "Retry-After": "1",
+                CLASS_HEADER: class_name,
+                QUEUE_TIME_HEADER: f"{e.queued_for * 1000:.1f}",
+            },
+        )
+
+    try:
+        response = await call_next(request)
+    finally:
+        admission_controller.release()
+
+    response.headers[CLASS_HEADER] = class_name
+    response.headers[QUEUE_TIME_HEADER] = f"{queued_for * 1000:.1f}"
+    return response
+
+
 app.include_router(search_router, prefix="/search", tags=["Search"])
 app.include_router(availability_router, prefix="/availability", tags=["Availability"])
 app.include_router(booking_router, prefix="/book", tags=["Booking"])
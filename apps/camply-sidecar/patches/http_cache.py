@@ -0,0 +1,321 @@
+"""
+Persistent on-disk HTTP cache for camply's Recreation.gov metadata requests.
+
+camply talks to RIDB / Recreation.gov through `requests`, refetching facility
+metadata (names, coordinates, descriptions) on every search even though it
+barely changes. We wrap `requests.Session.send` so that GET requests matching a
+known metadata endpoint class are served from a SQLite store keyed by a digest
+of the request. Anything that doesn't match (availability, GoingToCamp, booking)
+passes straight through.
+
+Per endpoint class:
+  - fresh for `ttl` seconds
+  - then served stale for up to `stale_while_revalidate` seconds while a
+    background thread refetches it
+  - served stale on upstream errors (exceptions or 5xx) rather than failing
+    the search
+
+The store is capped at CACHE_MAX_BYTES; least-recently-used entries are evicted.
+CAMPLY_HTTP_CACHE_PATH must point at persistent storage for the cache (and any
+warm-up) to survive a container rebuild — docker-compose.yml mounts the
+camply_http_cache volume for this.
+
+Pre-seed every US state with:
+    python -m patches.http_cache warm
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = os.getenv("CAMPLY_HTTP_CACHE_PATH", ".cache/camply-http.sqlite3")
+CACHE_MAX_BYTES = int(os.getenv("CAMPLY_HTTP_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Header marking responses served from the cache ("fresh" | "stale")
+CACHE_STATUS_HEADER = "X-Camply-Cache"
+
+US_STATES = [
+    "AL", "AK", "AZ", "AR", "CA", "CO", "CT", "DE", "DC", "FL", "GA", "HI",
+    "ID", "IL", "IN", "IA", "KS", "KY", "LA", "ME", "MD", "MA", "MI", "MN",
+    "MS", "MO", "MT", "NE", "NV", "NH", "NJ", "NM", "NY", "NC", "ND", "OH",
+    "OK", "OR", "PA", "RI", "SC", "SD", "TN", "TX", "UT", "VT", "VA", "WA",
+    "WV", "WI", "WY",
+]
+
+
+@dataclass
+class EndpointClass:
+    name: str
+    pattern: re.Pattern
+    ttl: float
+    stale_while_revalidate: float
+
+
+ENDPOINT_CLASSES = [
+    # RIDB facility / rec area / campsite listings — the search_for_campgrounds path
+    EndpointClass(
+        name="ridb_metadata",
+        pattern=re.compile(r"^https://ridb\.recreation\.gov/api/v1/(facilities|recareas|campsites)"),
+        ttl=7 * 24 * 3600,
+        stale_while_revalidate=7 * 24 * 3600,
+    ),
+    # Recreation.gov campground/campsite detail pages (not the availability grid)
+    EndpointClass(
+        name="rec_gov_metadata",
+        pattern=re.compile(r"^https://www\.recreation\.gov/api/camps/(campgrounds|campsites)/\d+/?$"),
+        ttl=24 * 3600,
+        stale_while_revalidate=3 * 24 * 3600,
+    ),
+]
+
+
+def match_endpoint(method: str, url: str) -> Optional[EndpointClass]:
+    if method != "GET":
+        return None
+    for endpoint in ENDPOINT_CLASSES:
+        if endpoint.pattern.match(url):
+            return endpoint
+    return None
+
+
+def request_key(method: str, url: str) -> str:
+    """Digest of the request with query parameters in canonical order."""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    canonical = urlunsplit((parts.scheme, parts.netloc.lower(), parts.path, query, ""))
+    return hashlib.sha256(f"{method} {canonical}".encode()).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    status_code: int
+    headers: dict
+    body: bytes
+    url: str
+    stored_at: float
+
+
+class HttpCache:
+    """SQLite-backed response store, safe to share across camply worker threads."""
+
+    def __init__(self, path: str = CACHE_PATH, max_bytes: int = CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                status_code INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+        )
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT status_code, headers, body, url, stored_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE responses SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+        status_code, headers, body, url, stored_at = row
+        return CacheEntry(status_code, json.loads(headers), body, url, stored_at)
+
+    def put(self, key: str, response: requests.Response) -> None:
+        body = response.content
+        now = time.time()
+        # Body is stored decoded, so drop headers describing the wire encoding
+        headers = {
+            k: v
+            for k, v in response.headers.items()
+            if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")
+        }
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, response.url, response.status_code, json.dumps(headers), body, len(body), now, now),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until the store is under 90% of its cap."""
+        (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()
+        if total <= self.max_bytes:
+            return
+
+        target = self.max_bytes * 0.9
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed_at")
+        evict = []
+        for key, size in rows:
+            if total <= target:
+                break
+            evict.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", evict)
+        logger.info(f"HTTP cache evicted {len(evict)} entries")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+
+_cache: Optional[HttpCache] = None
+_original_send = requests.Session.send
+_revalidating: set[str] = set()
+_revalidating_lock = threading.Lock()
+
+
+def _to_response(entry: CacheEntry, request: requests.PreparedRequest, status: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = entry.status_code
+    response.headers = CaseInsensitiveDict(entry.headers)
+    response.headers[CACHE_STATUS_HEADER] = status
+    response._content = entry.body
+    response.url = entry.url
+    response.request = request
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+def _store(key: str, response: requests.Response) -> requests.Response:
+    if response.status_code == 200:
+        _cache.put(key, response)
+    return response
+
+
+def _revalidate(
+    session: requests.Session, request: requests.PreparedRequest, key: str, kwargs: dict
+) -> None:
+    """
+    Refetch in the background through the originating session's mounted
+    adapter, so its retries/proxies apply. The prepared request already carries
+    the session's cookies and headers.
+    """
+    with _revalidating_lock:
+        if key in _revalidating:
+            return
+        _revalidating.add(key)
+
+    adapter = session.get_adapter(request.url)
+    # Adapters don't take Session.send's redirect options
+    send_kwargs = {k: v for k, v in kwargs.items() if k not in ("allow_redirects", "hooks")}
+
+    def run():
+        try:
+            _store(key, adapter.send(request, **send_kwargs))
+        except Exception as e:
+            logger.warning(f"Background revalidation failed for {request.url}: {e}")
+        finally:
+            with _revalidating_lock:
+                _revalidating.discard(key)
+
+    threading.Thread(target=run, daemon=True).start()
+
+
+def _cached_send(session: requests.Session, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+    endpoint = match_endpoint(request.method, request.url)
+    if endpoint is None or _cache is None or kwargs.get("stream"):
+        return _original_send(session, request, **kwargs)
+
+    key = request_key(request.method, request.url)
+    entry = _cache.get(key)
+    if entry is not None:
+        age = time.time() - entry.stored_at
+        if age < endpoint.ttl:
+            return _to_response(entry, request, "fresh")
+        if age < endpoint.ttl + endpoint.stale_while_revalidate:
+            _revalidate(session, request.copy(), key, kwargs)
+            return _to_response(entry, request, "stale")
+
+    try:
+        response = _store(key, _original_send(session, request, **kwargs))
+    except requests.RequestException as e:
+        if entry is None:
+            raise
+        logger.warning(f"Serving stale {endpoint.name} response after upstream error: {e}")
+        return _to_response(entry, request, "stale")
+
+    if response.status_code >= 500 and entry is not None:
+        logger.warning(
+            f"Serving stale {endpoint.name} response after upstream {response.status_code}"
+        )
+        return _to_response(entry, request, "stale")
+    return response
+
+
+def install_http_cache(path: str = CACHE_PATH, max_bytes: int = CACHE_MAX_BYTES) -> None:
+    """Route camply's metadata GETs through the on-disk cache. Safe to call twice."""
+    global _cache
+    try:
+        _cache = HttpCache(path, max_bytes)
+    except Exception as e:
+        logger.warning(f"Could not open HTTP cache at {path}, caching disabled: {e}")
+        return
+    requests.Session.send = _cached_send
+    logger.info(f"camply HTTP cache enabled at {path}")
+
+
+def warm(states: list[str]) -> None:
+    """Pre-seed the cache with Recreation.gov campgrounds for each state."""
+    from camply.providers.recreation_dot_gov import RecreationDotGov
+
+    install_http_cache()
+    provider = RecreationDotGov()
+    for state in states:
+        started = time.monotonic()
+        try:
+            campgrounds = provider.search_for_campgrounds(state=state)
+            logger.info(
+                f"Warmed {state}: {len(campgrounds)} campgrounds "
+                f"in {time.monotonic() - started:.1f}s"
+            )
+        except Exception as e:
+            logger.warning(f"Warm-up failed for {state}: {e}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the camply HTTP cache")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    warm_parser = subparsers.add_parser("warm", help="Pre-seed Recreation.gov metadata")
+    warm_parser.add_argument("states", nargs="*", default=US_STATES)
+    subparsers.add_parser("clear", help="Delete all cached responses")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.command == "warm":
+        warm(args.states)
+    else:
+        HttpCache().clear()
@@ -2,15 +2,28 @@
 Availability endpoint — check site availability via camply providers.
 """
 
-from datetime import date
+import asyncio
+import os
+from datetime import date, datetime
 from typing import Optional
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 import logging
 
+from services.availability_state import SiteDays, availability_grid
+from services.going_to_camp_client import NoSiteMapsError, get_site_availability
+from services.responses import encode_payload, payload_response
+
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Use the native async GoingToCamp client; set to "false" to fall back to camply
+NATIVE_GOING_TO_CAMP = os.getenv("GOINGTOCAMP_NATIVE_AVAILABILITY", "true").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
 
 class AvailabilityRequest(BaseModel):
     provider: str  # "going_to_camp" | "recreation_gov"
@@ -19,6 +32,8 @@ class AvailabilityRequest(BaseModel):
     end_date: date
     # GoingToCamp-specific
     domain: Optional[str] = None  # e.g. "reservations.ontarioparks.ca"
+    # Refetch the whole range instead of only the stale days
+    force_refresh: bool = False
 
 
 class SiteAvailability(BaseModel):
@@ -29,13 +44,19 @@ class SiteAvailability(BaseModel):
 
 
 @router.post("")
-async def check_availability(req: AvailabilityRequest):
-    """Check campsite availability via camply."""
+async def check_availability(req: AvailabilityRequest, request: Request):
+    """
+    Check campsite availability via camply.
+
+    GoingToCamp results come from an incrementally refreshed grid; the response
+    carries an ETag so pollers sending If-None-Match get a 304 when nothing has
+    changed.
+    """
     try:
         if req.provider == "going_to_camp":
-            return await _check_going_to_camp(req)
+            result = await _check_going_to_camp(req)
         elif req.provider == "recreation_gov":
-            return await _check_recreation_gov(req)
+            result = await _check_recreation_gov(req)
         else:
             raise HTTPException(400, f"Unsupported provider: {req.provider}")
     except HTTPException:
@@ -44,40 +65,38 @@ async def check_availability(req: AvailabilityRequest):
         logger.exception("Availability check failed")
         raise HTTPException(500, f"Availability check failed: {str(e)}")
 
+    return payload_response(request, encode_payload(result))
+
 
 async def _check_going_to_camp(req: AvailabilityRequest):
-    """Check availability on GoingToCamp platforms."""
-    from camply.providers.going_to_camp.going_to_camp_provider import (
-        GoingToCampProvider,
-    )
+    """
+    Check availability on GoingToCamp platforms.
 
+    Only the span of the requested dates that has gone stale is fetched from
+    upstream, in one call; the rest is served from the held grid.
+    """
     domain = req.domain or "reservations.ontarioparks.ca"
 
-    provider = GoingToCampProvider()
-    campsites = provider.get_campsites(
-        campground_id=int(req.campground_id),
-        start_date=req.start_date,
-        end_date=req.end_date,
-        domain=domain,
-    )
-
-    results = []
-    for site in campsites:
-        available_dates = [
-            d.strftime("%Y-%m-%d")
-            for d in getattr(site, "available_dates", [])
-        ]
-        results.append(
-            {
-                "site_id": str(getattr(site, "campsite_id", getattr(site, "id", ""))),
-                "site_name": getattr(
-                    site, "campsite_name", getattr(site, "name", "Unknown")
-                ),
-                "available": len(available_dates) > 0,
-                "available_dates": available_dates,
-            }
+    async def fetch(start_date: date, end_date: date) -> list[SiteDays]:
+        if NATIVE_GOING_TO_CAMP:
+            try:
+                return await get_site_availability(
+                    domain, int(req.campground_id), start_date, end_date
+                )
+            except NoSiteMapsError as e:
+                logger.warning(f"{e}; falling back to camply")
+        return await _fetch_going_to_camp_via_camply(
+            domain, req.campground_id, start_date, end_date
         )
 
+    results = await availability_grid.get(
+        key=(domain, req.campground_id),
+        start=req.start_date,
+        end=req.end_date,
+        fetch=fetch,
+        force=req.force_refresh,
+    )
+
     return {
         "results": results,
         "total": len(results),
@@ -85,12 +104,42 @@ async def _check_going_to_camp(req: AvailabilityRequest):
     }
 
 
+async def _fetch_going_to_camp_via_camply(
+    domain: str, campground_id: str, start_date: date, end_date: date
+) -> list[SiteDays]:
+    """Fallback path through camply's synchronous GoingToCampProvider."""
+    from camply.providers.going_to_camp.going_to_camp_provider import (
+        GoingToCampProvider,
+    )
+
+    provider = GoingToCampProvider()
+    campsites = await asyncio.to_thread(
+        provider.get_campsites,
+        campground_id=int(campground_id),
+        start_date=start_date,
+        end_date=end_date,
+        domain=domain,
+    )
+    return [
+        SiteDays(
+            site_id=str(getattr(site, "campsite_id", getattr(site, "id", ""))),
+            site_name=getattr(site, "campsite_name", getattr(site, "name", "Unknown")),
+            available_dates=[
+                d.date() if isinstance(d, datetime) else d
+                for d in getattr(site, "available_dates", [])
+            ],
+        )
+        for site in campsites
+    ]
+
+
 async def _check_recreation_gov(req: AvailabilityRequest):
     """Check availability on Recreation.gov."""
     from camply.providers.recreation_dot_gov import RecreationDotGov
 
     provider = RecreationDotGov()
-    campsites = provider.get_campsites(
+    campsites = await asyncio.to_thread(
+        provider.get_campsites,
         campground_id=int(req.campground_id),
         start_date=req.start_date,
         end_date=req.end_date,
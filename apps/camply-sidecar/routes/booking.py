@@ -7,8 +7,14 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 import logging
 
-from services.session_manager import authenticate, AuthenticationError
-from services.booking_executor import execute_booking
+from services.session_manager import (
+    SESSION_KINDS,
+    authenticate,
+    session_from_token,
+    session_kind,
+    AuthenticationError,
+)
+from services.booking_executor import execute_booking, execute_fanout_booking
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -31,6 +37,8 @@ class LoginRequest(BaseModel):
 class LoginResponse(BaseModel):
     success: bool
     session_token: Optional[str] = None
+    # "bearer" | "cookie" — pass back with session_token when reusing it
+    session_kind: Optional[str] = None
     error: Optional[str] = None
 
 
@@ -55,6 +63,46 @@ class BookResponse(BaseModel):
     site_id: Optional[str] = None
     confirmation_number: Optional[str] = None
     error: Optional[str] = None
+    # Checkout may have gone through; check the account before rebooking
+    outcome_unknown: bool = False
+
+
+class BookingAccount(BaseModel):
+    # Either credentials or a warm session token from /book/login
+    username: Optional[str] = None
+    password: Optional[str] = None
+    session_token: Optional[str] = None
+    session_kind: Optional[str] = None  # "bearer" | "cookie", from /book/login
+    # Identifies the account in the result; defaults to username or position
+    label: Optional[str] = None
+
+
+class FanoutBookRequest(BaseModel):
+    platform: str
+    accounts: list[BookingAccount]
+    campground_id: str
+    site_preferences: list[str]
+    arrival_date: str  # YYYY-MM-DD
+    departure_date: str  # YYYY-MM-DD
+    equipment_type: str
+    occupants: int
+    domain: Optional[str] = None
+    preference_mode: str = "shared"  # "shared" | "disjoint"
+    latency_budget_ms: Optional[int] = None
+
+
+class AccountAttempt(BaseModel):
+    account: str
+    success: bool
+    site_id: Optional[str] = None
+    error: Optional[str] = None
+    outcome_unknown: bool = False
+
+
+class FanoutBookResponse(BookResponse):
+    winning_account: Optional[str] = None
+    elapsed_ms: float = 0.0
+    attempts: list[AccountAttempt] = []
 
 
 @router.post("/login", response_model=LoginResponse)
@@ -72,6 +120,7 @@ async def login(req: LoginRequest):
         return LoginResponse(
             success=True,
             session_token=session.auth_token or session.session_cookie,
+            session_kind=session_kind(session),
         )
     except AuthenticationError as e:
         return LoginResponse(success=False, error=str(e))
@@ -115,6 +164,7 @@ async def book(req: BookRequest):
             site_id=result.site_id,
             confirmation_number=result.confirmation_number,
             error=result.error,
+            outcome_unknown=result.outcome_unknown,
         )
 
     except AuthenticationError as e:
@@ -122,3 +172,92 @@ async def book(req: BookRequest):
     except Exception as e:
         logger.exception("Booking failed")
         return BookResponse(success=False, error=f"Booking failed: {str(e)}")
+
+
+@router.post("/fanout", response_model=FanoutBookResponse)
+async def book_fanout(req: FanoutBookRequest):
+    """
+    Race several linked accounts at the same snipe.
+
+    Every account logs in (or reuses its warm session) and runs the booking
+    flow concurrently; the first confirmation wins and the rest are stopped.
+    """
+    domain = req.domain or PLATFORM_DOMAINS.get(req.platform)
+    if not domain:
+        raise HTTPException(400, f"Unknown platform: {req.platform}")
+    if not req.accounts:
+        raise HTTPException(400, "At least one account is required")
+    if req.preference_mode not in ("shared", "disjoint"):
+        raise HTTPException(400, f"Unknown preference_mode: {req.preference_mode}")
+
+    session_factories = {}
+    for i, account in enumerate(req.accounts):
+        label = account.label or account.username or f"account-{i + 1}"
+        if label in session_factories:
+            label = f"{label}-{i + 1}"
+
+        if account.session_token:
+            if account.session_kind not in SESSION_KINDS:
+                raise HTTPException(
+                    400,
+                    f"Account {label} needs session_kind "
+                    f"({' or '.join(SESSION_KINDS)}) with its session_token",
+                )
+            session = session_from_token(
+                domain, account.session_token, account.session_kind
+            )
+
+            async def warm(session=session):
+                return session
+
+            session_factories[label] = warm
+        elif account.username and account.password:
+
+            async def login(username=account.username, password=account.password):
+                return await authenticate(domain, username, password)
+
+            session_factories[label] = login
+        else:
+            raise HTTPException(
+                400, f"Account {label} needs a session_token or username and password"
+            )
+
+    try:
+        fanout = await execute_fanout_booking(
+            session_factories=session_factories,
+            campground_id=req.campground_id,
+            site_preferences=req.site_preferences,
+            arrival_date=req.arrival_date,
+            departure_date=req.departure_date,
+            equipment_type=req.equipment_type,
+            occupants=req.occupants,
+            disjoint=req.preference_mode == "disjoint",
+            latency_budget=(
+                req.latency_budget_ms / 1000 if req.latency_budget_ms else None
+            ),
+        )
+    except Exception as e:
+        logger.exception("Fan-out booking failed")
+        return FanoutBookResponse(success=False, error=f"Booking failed: {str(e)}")
+
+    result = fanout.result
+    return FanoutBookResponse(
+        success=result.success,
+        booking_id=result.booking_id,
+        site_id=result.site_id,
+        confirmation_number=result.confirmation_number,
+        error=result.error,
+        outcome_unknown=result.outcome_unknown,
+        winning_account=fanout.winning_account,
+        elapsed_ms=round(fanout.elapsed * 1000, 1),
+        attempts=[
+            AccountAttempt(
+                account=label,
+                success=attempt.success,
+                site_id=attempt.site_id,
+                error=attempt.error,
+                outcome_unknown=attempt.outcome_unknown,
+            )
+            for label, attempt in fanout.attempts.items()
+        ],
+    )
@@ -2,15 +2,25 @@
 Search endpoint — delegates to camply's provider search.
 """
 
+import asyncio
 from datetime import date
 from typing import Optional
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 import logging
 
+from services.responses import (
+    CachedPayload,
+    catalogue_cache,
+    encode_payload,
+    payload_response,
+)
+
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+DEFAULT_DOMAIN = "reservations.ontarioparks.ca"
+
 
 class SearchRequest(BaseModel):
     provider: str  # "going_to_camp" | "recreation_gov"
@@ -31,13 +41,28 @@ class CampgroundResult(BaseModel):
 
 
 @router.post("")
-async def search_campgrounds(req: SearchRequest):
-    """Search for campgrounds via camply providers."""
+async def search_campgrounds(req: SearchRequest, request: Request):
+    """
+    Search for campgrounds via camply providers.
+
+    Results are cached pre-serialised and served with an ETag; clients sending
+    a matching If-None-Match get a 304. GoingToCamp has no upstream search, so
+    its full catalogue is cached once per domain and filtered per query.
+    """
     try:
         if req.provider == "going_to_camp":
-            return await _search_going_to_camp(req)
+            catalogue = await _going_to_camp_catalogue(req.domain or DEFAULT_DOMAIN)
+            if not req.query:
+                return payload_response(request, catalogue)
+            return payload_response(
+                request, encode_payload(_filter_catalogue(catalogue, req.query))
+            )
         elif req.provider == "recreation_gov":
-            return await _search_recreation_gov(req)
+            cache_key = (req.provider, req.query, req.state)
+            payload = catalogue_cache.get(cache_key)
+            if payload is None:
+                payload = catalogue_cache.put(cache_key, await _search_recreation_gov(req))
+            return payload_response(request, payload)
         else:
             raise HTTPException(400, f"Unsupported provider: {req.provider}")
     except HTTPException:
@@ -47,33 +72,51 @@ async def search_campgrounds(req: SearchRequest):
         raise HTTPException(500, f"Search failed: {str(e)}")
 
 
-async def _search_going_to_camp(req: SearchRequest):
-    """Search GoingToCamp campgrounds (Ontario Parks, Parks Canada, etc.)."""
+async def _going_to_camp_catalogue(domain: str) -> CachedPayload:
+    """
+    Unfiltered campground catalogue for a GoingToCamp domain. The attachment
+    holds (search text, row) pairs for query filtering.
+    """
+    cache_key = ("going_to_camp", domain)
+    payload = catalogue_cache.get(cache_key)
+    if payload is not None:
+        return payload
+
+    campgrounds = await _list_going_to_camp(domain)
+
+    rows = []
+    index = []
+    for cg in campgrounds:
+        row = {
+            "id": str(getattr(cg, "facility_id", getattr(cg, "id", ""))),
+            "name": getattr(cg, "facility_name", getattr(cg, "name", "Unknown")),
+            "description": getattr(cg, "description", None),
+            "latitude": getattr(cg, "latitude", None),
+            "longitude": getattr(cg, "longitude", None),
+        }
+        rows.append(row)
+        index.append((str(cg).lower(), row))
+
+    return catalogue_cache.put(
+        cache_key,
+        {"results": rows, "total": len(rows), "provider": "going_to_camp"},
+        attachment=index,
+    )
+
+
+async def _list_going_to_camp(domain: str) -> list:
+    """List every campground on a GoingToCamp platform (Ontario Parks, Parks Canada, etc.)."""
     from camply.providers.going_to_camp.going_to_camp_provider import (
         GoingToCampProvider,
     )
 
-    domain = req.domain or "reservations.ontarioparks.ca"
-
     provider = GoingToCampProvider()
-    campgrounds = provider.list_campgrounds(domain=domain)
+    return await asyncio.to_thread(provider.list_campgrounds, domain=domain)
 
-    results = []
-    for cg in campgrounds:
-        # Filter by query if provided
-        if req.query and req.query.lower() not in str(cg).lower():
-            continue
-
-        results.append(
-            {
-                "id": str(getattr(cg, "facility_id", getattr(cg, "id", ""))),
-                "name": getattr(cg, "facility_name", getattr(cg, "name", "Unknown")),
-                "description": getattr(cg, "description", None),
-                "latitude": getattr(cg, "latitude", None),
-                "longitude": getattr(cg, "longitude", None),
-            }
-        )
 
+def _filter_catalogue(catalogue: CachedPayload, query: str) -> dict:
+    needle = query.lower()
+    results = [row for text, row in catalogue.attachment if needle in text]
     return {"results": results, "total": len(results), "provider": "going_to_camp"}
 
 
@@ -84,9 +127,13 @@ async def _search_recreation_gov(req: SearchRequest):
     provider = RecreationDotGov()
 
     if req.query:
-        campgrounds = provider.search_for_campgrounds(search_string=req.query)
+        campgrounds = await asyncio.to_thread(
+            provider.search_for_campgrounds, search_string=req.query
+        )
     elif req.state:
-        campgrounds = provider.search_for_campgrounds(state=req.state)
+        campgrounds = await asyncio.to_thread(
+            provider.search_for_campgrounds, state=req.state
+        )
     else:
         raise HTTPException(400, "query or state required for recreation_gov search")
 
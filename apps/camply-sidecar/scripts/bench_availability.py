@@ -0,0 +1,186 @@
+"""
+Benchmark GoingToCamp availability fetches: native async client vs camply.
+
+Measures latency (p50/p99) and memory (peak during the fetch + decode, and
+what the decoded result keeps alive) per campground.
+
+Synthetic mode (default) serves a generated map tree, site list and daily
+availability grid from an httpx.MockTransport, so only the native client's
+request fan-out and decoding are measured. camply can't be pointed at a mock
+transport, so it is only measured in live mode.
+
+Live mode fetches one real campground through both paths — the native client
+and routes.availability's camply fallback — and needs camply installed and
+network access. Every run hits the reservation site, so it defaults to 3 runs.
+
+    cd apps/camply-sidecar && python -m scripts.bench_availability [--sites N --days N --maps N]
+    cd apps/camply-sidecar && python -m scripts.bench_availability --live \\
+        --domain reservations.ontarioparks.ca --campground-id <resourceLocationId>
+"""
+
+import argparse
+import asyncio
+import gc
+import time
+import tracemalloc
+from datetime import date, timedelta
+from typing import Awaitable, Callable
+
+import httpx
+import orjson
+
+from services import going_to_camp_client
+from services.availability_state import SiteDays
+
+SYNTHETIC_DOMAIN = "bench.test"
+SYNTHETIC_CAMPGROUND = 1
+
+Fetch = Callable[[], Awaitable[list[SiteDays]]]
+
+
+def synthetic_upstream(sites: int, days: int, maps: int) -> httpx.MockTransport:
+    per_map = -(-sites // maps)
+    tree = [{"mapId": 100, "resourceLocationId": SYNTHETIC_CAMPGROUND, "mapResources": []}] + [
+        {"mapId": 101 + m, "resourceLocationId": SYNTHETIC_CAMPGROUND, "mapResources": [1]}
+        for m in range(maps)
+    ]
+    resources = [
+        {"resourceId": r, "localizedValues": [{"name": f"Site {r}"}]} for r in range(sites)
+    ]
+    grids = {
+        101 + m: {
+            "resourceAvailabilities": {
+                str(r): [
+                    {"availability": 0 if (r + d) % 3 == 0 else 1, "remainingQuota": None}
+                    for d in range(days)
+                ]
+                for r in range(m * per_map, min(sites, (m + 1) * per_map))
+            }
+        }
+        for m in range(maps)
+    }
+
+    # Encoded once up front so the mock's own serialisation isn't measured
+    tree_body = orjson.dumps(tree)
+    resources_body = orjson.dumps(resources)
+    grid_bodies = {map_id: orjson.dumps(grid) for map_id, grid in grids.items()}
+    print(f"upstream: {sum(map(len, grid_bodies.values())) / 1e6:.1f} MB of availability per fetch")
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == going_to_camp_client.MAPS_ENDPOINT:
+            body = tree_body
+        elif path == going_to_camp_client.RESOURCES_ENDPOINT:
+            body = resources_body
+        else:
+            body = grid_bodies[int(request.url.params["mapId"])]
+        return httpx.Response(200, content=body, headers={"Content-Type": "application/json"})
+
+    return httpx.MockTransport(handler)
+
+
+async def measure_latency(fetch: Fetch, runs: int) -> tuple[float, float, int]:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        sites = await fetch()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    p50 = timings[len(timings) // 2] * 1000
+    p99 = timings[max(0, int(len(timings) * 0.99) - 1)] * 1000
+    return p50, p99, len(sites)
+
+
+async def measure_memory(fetch: Fetch) -> tuple[float, float]:
+    """(peak MB during the fetch, MB still held by its result)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        sites = await fetch()
+        # Let transport callbacks scheduled by the fetch run before measuring
+        await asyncio.sleep(0)
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del sites
+    return (peak - before) / 1e6, (current - before) / 1e6
+
+
+async def report(name: str, fetch: Fetch, runs: int) -> None:
+    # One untimed call warms the per-domain/per-campground metadata caches
+    await fetch()
+    p50, p99, sites = await measure_latency(fetch, runs)
+    peak, retained = await measure_memory(fetch)
+    print(
+        f"{name:<8} {sites:5d} sites  p50 {p50:8.1f}ms  p99 {p99:8.1f}ms  "
+        f"peak {peak:6.2f} MB  retained {retained:6.2f} MB"
+    )
+
+
+async def synthetic(args) -> None:
+    transport = synthetic_upstream(args.sites, args.days, args.maps)
+    start = date.today()
+    end = start + timedelta(days=args.days - 1)
+
+    async with httpx.AsyncClient(transport=transport) as client:
+
+        async def native():
+            return await going_to_camp_client.get_site_availability(
+                SYNTHETIC_DOMAIN, SYNTHETIC_CAMPGROUND, start, end, client=client
+            )
+
+        print(f"{args.sites} sites x {args.days} days over {args.maps} maps, {args.runs} runs")
+        await report("native", native, args.runs)
+
+
+async def live(args) -> None:
+    from routes.availability import _fetch_going_to_camp_via_camply
+    from services.http_client import close_shared_transport
+
+    start = date.fromisoformat(args.start) if args.start else date.today() + timedelta(days=30)
+    end = start + timedelta(days=args.days - 1)
+
+    async def native():
+        return await going_to_camp_client.get_site_availability(
+            args.domain, int(args.campground_id), start, end
+        )
+
+    async def camply():
+        return await _fetch_going_to_camp_via_camply(
+            args.domain, args.campground_id, start, end
+        )
+
+    print(f"{args.domain} campground {args.campground_id}, {start}..{end}, {args.runs} runs")
+    try:
+        await report("native", native, args.runs)
+        await report("camply", camply, args.runs)
+    finally:
+        await close_shared_transport()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, help="Timed runs (default 50, or 3 with --live)")
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--sites", type=int, default=400)
+    parser.add_argument("--maps", type=int, default=4)
+    parser.add_argument("--live", action="store_true", help="Compare against camply on a real campground")
+    parser.add_argument("--domain", default="reservations.ontarioparks.ca")
+    parser.add_argument("--campground-id")
+    parser.add_argument("--start", help="First date (YYYY-MM-DD); defaults to 30 days out")
+    args = parser.parse_args()
+
+    if args.live:
+        if not args.campground_id:
+            parser.error("--live needs --campground-id")
+        args.runs = args.runs or 3
+        asyncio.run(live(args))
+    else:
+        args.runs = args.runs or 50
+        asyncio.run(synthetic(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark /search response latency on a large synthetic GoingToCamp catalogue.
+
+Compares the pre-orjson baseline (a plain FastAPI route returning the dict
+through jsonable_encoder + stdlib json) with the sidecar's cached-bytes path,
+a query-filtered request, and an If-None-Match revalidation. camply is stubbed
+out so only the response layer is measured.
+
+    cd apps/camply-sidecar && python -m scripts.bench_responses [--campgrounds N]
+"""
+
+import argparse
+import time
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+
+
+def make_catalogue(size: int) -> list:
+    return [
+        SimpleNamespace(
+            facility_id=i,
+            facility_name=f"Campground {i}",
+            description="x" * 200,
+            latitude=44.1 + i / 1e4,
+            longitude=-79.2,
+        )
+        for i in range(size)
+    ]
+
+
+def measure(client: TestClient, body: dict, runs: int, headers: dict = None):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        response = client.post("/search", json=body, headers=headers or {})
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    p50 = timings[len(timings) // 2] * 1000
+    p99 = timings[max(0, int(len(timings) * 0.99) - 1)] * 1000
+    return response, p50, p99
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--campgrounds", type=int, default=20000)
+    parser.add_argument("--runs", type=int, default=60)
+    args = parser.parse_args()
+
+    import main as sidecar
+    from routes import search
+    from services.responses import catalogue_cache
+
+    catalogue = make_catalogue(args.campgrounds)
+
+    async def list_campgrounds(domain):
+        return catalogue
+
+    search._list_going_to_camp = list_campgrounds
+    catalogue_cache.clear()
+
+    rows = {
+        "results": [
+            {
+                "id": str(cg.facility_id),
+                "name": cg.facility_name,
+                "description": cg.description,
+                "latitude": cg.latitude,
+                "longitude": cg.longitude,
+            }
+            for cg in catalogue
+        ],
+        "total": len(catalogue),
+        "provider": "going_to_camp",
+    }
+    baseline = FastAPI(default_response_class=JSONResponse)
+
+    @baseline.post("/search")
+    async def baseline_search():
+        return rows
+
+    body = {"provider": "going_to_camp"}
+    response, p50, p99 = measure(TestClient(baseline), body, args.runs)
+    print(f"baseline (stdlib json):   p50 {p50:7.1f}ms  p99 {p99:7.1f}ms  {len(response.content) / 1e6:.1f} MB")
+
+    client = TestClient(sidecar.app)
+    response, p50, p99 = measure(client, body, args.runs)
+    print(f"cached bytes:             p50 {p50:7.1f}ms  p99 {p99:7.1f}ms")
+
+    etag = response.headers["etag"]
+    response, p50, p99 = measure(client, body, args.runs, headers={"If-None-Match": etag})
+    print(f"If-None-Match (304):      p50 {p50:7.1f}ms  p99 {p99:7.1f}ms  status {response.status_code}")
+
+    response, p50, p99 = measure(client, {**body, "query": "campground 19"}, args.runs)
+    print(f"filtered query:           p50 {p50:7.1f}ms  p99 {p99:7.1f}ms  {response.json()['total']} hits")
+
+
+if __name__ == "__main__":
+    main()
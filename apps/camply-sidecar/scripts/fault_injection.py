@@ -0,0 +1,247 @@
+"""
+Fault-injection checks for the booking executor's hedging, retries and fan-out.
+
+Runs the real executor against an httpx.MockTransport that stalls, drops,
+times out or 503s scripted upstream calls, and asserts on what reached
+"upstream". Exits non-zero if any scenario fails.
+
+    cd apps/camply-sidecar && python -m scripts.fault_injection
+"""
+
+import asyncio
+import sys
+import time
+from collections import Counter
+from typing import Awaitable, Callable, Optional
+
+import httpx
+
+from services import booking_executor
+from services.booking_executor import execute_booking, execute_fanout_booking
+from services.resilience import retry_budget
+from services.session_manager import SessionInfo
+
+AVAILABLE = {"resourceAvailabilities": [{"resourceLocationId": 7, "available": True}]}
+
+# Per-path fault script: called with the 1-based call number for that path,
+# returns a Response, raises an httpx error, or returns None for the default.
+Fault = Callable[[int], Awaitable[Optional[httpx.Response]]]
+
+
+class FaultyUpstream:
+    def __init__(self, faults: Optional[dict[str, Fault]] = None):
+        self.faults = faults or {}
+        self.calls: Counter = Counter()
+        self.log: list[tuple[str, str]] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        step = request.url.path.rsplit("/", 1)[-1]
+        self.calls[step] += 1
+        self.log.append((step, request.headers.get("X-Account", "")))
+
+        fault = self.faults.get(step)
+        if fault is not None:
+            response = await fault(self.calls[step])
+            if response is not None:
+                return response
+
+        if step == "map":
+            return httpx.Response(200, json=AVAILABLE)
+        if step == "add":
+            return httpx.Response(200, json={"cartId": 1})
+        if step == "checkout":
+            return httpx.Response(200, json={"reservationId": "R1", "confirmationNumber": "C1"})
+        if step == "remove":
+            return httpx.Response(200)
+        return httpx.Response(404)
+
+    def client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(transport=httpx.MockTransport(self))
+
+
+def session(domain: str, account: str = "") -> SessionInfo:
+    return SessionInfo(domain=domain, session_cookie="c", auth_token="", headers={"X-Account": account})
+
+
+async def book(upstream: FaultyUpstream, domain: str):
+    async with upstream.client() as client:
+        return await execute_booking(
+            session(domain), "1", ["7"], "2026-07-01", "2026-07-03", "tent", 2, client=client
+        )
+
+
+async def stalled_probe_is_hedged():
+    async def stall_first(n):
+        if n == 1:
+            await asyncio.sleep(10)
+
+    upstream = FaultyUpstream({"map": stall_first})
+    started = time.monotonic()
+    result = await book(upstream, "hedge.test")
+    elapsed = time.monotonic() - started
+
+    assert result.success, result
+    assert upstream.calls["map"] == 2, upstream.calls
+    assert elapsed < 1.5, f"hedge took {elapsed:.2f}s"
+
+
+async def unanswered_probe_respects_budget():
+    async def never(n):
+        await asyncio.sleep(10)
+
+    upstream = FaultyUpstream({"map": never})
+    started = time.monotonic()
+    result = await book(upstream, "budget.test")
+    elapsed = time.monotonic() - started
+
+    assert not result.success, result
+    assert upstream.calls["map"] == 2, upstream.calls
+    assert elapsed < booking_executor.AVAILABILITY_BUDGET + 0.3, f"took {elapsed:.2f}s"
+
+
+async def cart_retries_drop_and_503():
+    async def drop_then_503(n):
+        if n == 1:
+            raise httpx.ConnectError("connection dropped")
+        if n == 2:
+            return httpx.Response(503, headers={"Retry-After": "0"})
+
+    upstream = FaultyUpstream({"add": drop_then_503})
+    result = await book(upstream, "cart.test")
+
+    assert result.success, result
+    assert upstream.calls["add"] == 3, upstream.calls
+
+
+async def ambiguous_cart_is_not_retried():
+    async def read_timeout(n):
+        raise httpx.ReadTimeout("no response")
+
+    upstream = FaultyUpstream({"add": read_timeout})
+    result = await book(upstream, "cart-ambiguous.test")
+
+    assert not result.success, result
+    assert upstream.calls["add"] == 1, upstream.calls
+    assert upstream.calls["checkout"] == 0, upstream.calls
+
+
+async def gateway_timeout_on_checkout_is_not_retried():
+    async def gateway_timeout(n):
+        if n == 1:
+            return httpx.Response(504)
+
+    upstream = FaultyUpstream({"checkout": gateway_timeout})
+    result = await book(upstream, "checkout-504.test")
+
+    assert not result.success, result
+    assert upstream.calls["checkout"] == 1, upstream.calls
+
+
+async def ambiguous_checkout_is_not_retried():
+    async def read_timeout(n):
+        raise httpx.ReadTimeout("no response")
+
+    upstream = FaultyUpstream({"checkout": read_timeout})
+    result = await book(upstream, "checkout.test")
+
+    assert not result.success, result
+    assert upstream.calls["checkout"] == 1, upstream.calls
+
+
+def account(domain: str, name: str):
+    async def factory():
+        return session(domain, name)
+
+    return factory
+
+
+async def fanout(upstream: FaultyUpstream, domain: str, accounts: Optional[dict] = None, **kwargs):
+    original_new_client = booking_executor.new_client
+    booking_executor.new_client = upstream.client
+    try:
+        return await execute_fanout_booking(
+            accounts or {"A": account(domain, "A"), "B": account(domain, "B")},
+            "1", ["7"], "2026-07-01", "2026-07-03", "tent", 2,
+            **kwargs,
+        )
+    finally:
+        booking_executor.new_client = original_new_client
+
+
+async def fanout_checks_out_once():
+    async def slow_checkout(n):
+        await asyncio.sleep(0.2)
+
+    upstream = FaultyUpstream({"checkout": slow_checkout})
+    result = await fanout(upstream, "fanout.test")
+
+    loser = "B" if result.winning_account == "A" else "A"
+    assert result.result.success, result
+    assert upstream.calls["checkout"] == 1, upstream.log
+    assert ("remove", loser) in upstream.log, upstream.log
+    assert not result.attempts[loser].success, result.attempts
+
+
+async def fanout_stops_after_ambiguous_checkout():
+    async def slow_read_timeout(n):
+        await asyncio.sleep(0.2)
+        raise httpx.ReadTimeout("no response")
+
+    upstream = FaultyUpstream({"checkout": slow_read_timeout})
+    result = await fanout(upstream, "fanout-ambiguous.test")
+
+    first = next(account for step, account in upstream.log if step == "checkout")
+    other = "B" if first == "A" else "A"
+    assert not result.result.success, result
+    assert result.result.outcome_unknown, result
+    assert upstream.calls["checkout"] == 1, upstream.log
+    assert result.attempts[first].outcome_unknown, result.attempts
+    assert not result.attempts[other].outcome_unknown, result.attempts
+    assert ("remove", other) in upstream.log, upstream.log
+
+
+async def fanout_budget_bounds_login():
+    async def slow_login():
+        await asyncio.sleep(30)
+
+    upstream = FaultyUpstream()
+    started = time.monotonic()
+    result = await fanout(
+        upstream, "login.test", {"A": slow_login, "B": slow_login}, latency_budget=0.3
+    )
+    elapsed = time.monotonic() - started
+
+    assert not result.result.success, result
+    assert elapsed < 0.6, f"took {elapsed:.2f}s"
+    assert not upstream.calls, upstream.calls
+
+
+SCENARIOS = [
+    stalled_probe_is_hedged,
+    unanswered_probe_respects_budget,
+    cart_retries_drop_and_503,
+    ambiguous_cart_is_not_retried,
+    ambiguous_checkout_is_not_retried,
+    gateway_timeout_on_checkout_is_not_retried,
+    fanout_checks_out_once,
+    fanout_stops_after_ambiguous_checkout,
+    fanout_budget_bounds_login,
+]
+
+
+async def main() -> int:
+    failures = 0
+    for scenario in SCENARIOS:
+        # Each scenario starts with a full retry budget
+        retry_budget.tokens = retry_budget.max_tokens
+        try:
+            await scenario()
+            print(f"PASS  {scenario.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"FAIL  {scenario.__name__}: {e}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,148 @@
+"""
+Priority-aware admission control for sidecar requests.
+
+Every request is classified (booking > login > availability > search) and must
+take a slot from a shared pool before its handler runs. Each class has a
+ceiling on how much of the pool it may occupy, so the top slots are held back
+for booking: a burst of scanner polls can fill the search/availability share
+but never the headroom a /book call needs. When the pool is full, requests
+queue in priority order; low-priority requests that wait too long (or find
+their queue already full) are shed with a 503 and Retry-After.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_CONCURRENCY = 16
+
+QUEUE_TIME_HEADER = "X-Admission-Queue-Ms"
+CLASS_HEADER = "X-Admission-Class"
+
+
+class RequestClass(IntEnum):
+    """Lower value = higher priority."""
+
+    BOOKING = 0
+    LOGIN = 1
+    AVAILABILITY = 2
+    SEARCH = 3
+
+
+@dataclass
+class ClassPolicy:
+    # Total in-flight requests (all classes) above which this class must queue
+    ceiling: int
+    # Seconds to wait for a slot before shedding; None = wait indefinitely
+    max_wait: Optional[float] = None
+    # Queue depth at which new arrivals are shed immediately; None = unbounded
+    max_queued: Optional[int] = None
+
+
+DEFAULT_POLICIES = {
+    RequestClass.BOOKING: ClassPolicy(ceiling=MAX_CONCURRENCY),
+    RequestClass.LOGIN: ClassPolicy(ceiling=MAX_CONCURRENCY - 2, max_wait=10.0, max_queued=32),
+    RequestClass.AVAILABILITY: ClassPolicy(ceiling=MAX_CONCURRENCY - 4, max_wait=5.0, max_queued=64),
+    RequestClass.SEARCH: ClassPolicy(ceiling=MAX_CONCURRENCY // 2, max_wait=2.0, max_queued=32),
+}
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, request_class: RequestClass, queued_for: float, reason: str):
+        super().__init__(reason)
+        self.request_class = request_class
+        self.queued_for = queued_for
+
+
+def classify(path: str) -> Optional[RequestClass]:
+    """Map a request path to its class; None means the request bypasses admission."""
+    if path.startswith("/book/login"):
+        return RequestClass.LOGIN
+    if path.startswith("/book"):
+        return RequestClass.BOOKING
+    if path.startswith("/availability"):
+        return RequestClass.AVAILABILITY
+    if path.startswith("/search"):
+        return RequestClass.SEARCH
+    return None
+
+
+class AdmissionController:
+    def __init__(self, policies: dict[RequestClass, ClassPolicy] = DEFAULT_POLICIES):
+        self.policies = policies
+        self.in_flight = 0
+        self._waiters: dict[RequestClass, deque[asyncio.Future]] = {
+            cls: deque() for cls in RequestClass
+        }
+
+    async def acquire(self, request_class: RequestClass) -> float:
+        """
+        Wait for a slot. Returns the time spent queued, in seconds.
+        Raises AdmissionRejected if the request is shed.
+        """
+        policy = self.policies[request_class]
+        started = time.monotonic()
+
+        if self.in_flight < policy.ceiling and not self._has_waiters(request_class):
+            self.in_flight += 1
+            return 0.0
+
+        queue = self._waiters[request_class]
+        if policy.max_queued is not None and len(queue) >= policy.max_queued:
+            raise AdmissionRejected(request_class, 0.0, "Admission queue full")
+
+        future = asyncio.get_running_loop().create_future()
+        queue.append(future)
+        try:
+            await asyncio.wait_for(future, policy.max_wait)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # A slot was handed over just as we gave up — return it
+                self.release()
+            else:
+                try:
+                    queue.remove(future)
+                except ValueError:
+                    pass
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise AdmissionRejected(
+                request_class, time.monotonic() - started, "Timed out waiting for capacity"
+            )
+
+        return time.monotonic() - started
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def _has_waiters(self, request_class: RequestClass) -> bool:
+        """True if this class or any higher-priority class is already queued."""
+        return any(self._waiters[cls] for cls in RequestClass if cls <= request_class)
+
+    def _wake(self) -> None:
+        # Hand freed slots to waiters strictly in priority order. A higher class
+        # always has a ceiling at least as high as a lower one, so if it cannot
+        # be admitted, nothing below it can be either.
+        for cls in RequestClass:
+            queue = self._waiters[cls]
+            ceiling = self.policies[cls].ceiling
+            while queue and self.in_flight < ceiling:
+                future = queue.popleft()
+                if future.done():
+                    continue
+                self.in_flight += 1
+                future.set_result(None)
+            if queue:
+                return
+
+
+admission_controller = AdmissionController()
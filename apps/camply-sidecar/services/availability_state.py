@@ -0,0 +1,164 @@
+"""
+Incremental availability refresh.
+
+The API scanner polls each alert once per scan cycle (60s), and several alerts
+often watch the same campground over overlapping dates. Instead of every poll
+re-downloading its whole sites × days grid, we hold the grid per campground
+and only refetch the days that have gone stale.
+
+A day goes stale after MAX_AGE_SECONDS, a little under one scan cycle, for
+every date no matter how far out: cancellations and window-open releases on
+far dates must be seen on the next cycle, and upstream offers no change signal
+that would let us safely hold a day longer. So no day is ever served older
+than one cycle; what the grid saves is the repeat fetches when several polls
+of the same campground land within one cycle.
+
+Upstream returns a whole date range per map in a single call, so splitting a
+refresh into several sub-ranges would cost more requests, not fewer. Each
+poll therefore makes at most one fetch: the range from the first to the last
+stale day. It is skipped entirely when nothing is stale.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Awaitable, Callable, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Must match the API scanner's poll interval (availability-scanner.worker.ts)
+SCAN_INTERVAL_SECONDS = float(os.getenv("CAMPLY_SCAN_INTERVAL_SECONDS", "60"))
+# Slightly under one cycle, so the next cycle's poll always refetches
+MAX_AGE_SECONDS = SCAN_INTERVAL_SECONDS - 5.0
+
+MAX_CAMPGROUNDS = 512
+
+
+@dataclass(slots=True)
+class SiteDays:
+    site_id: str
+    site_name: str
+    available_dates: list[date]
+
+
+# Fetches availability for one campground over an inclusive date range
+Fetcher = Callable[[date, date], Awaitable[list[SiteDays]]]
+
+
+@dataclass
+class CampgroundGrid:
+    site_names: dict[str, str] = field(default_factory=dict)
+    available: dict[str, set[date]] = field(default_factory=dict)
+    # When each day was last fetched from upstream
+    refreshed_at: dict[date, float] = field(default_factory=dict)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class IncrementalAvailability:
+    def __init__(self, max_campgrounds: int = MAX_CAMPGROUNDS):
+        self.max_campgrounds = max_campgrounds
+        self._grids: OrderedDict[Hashable, CampgroundGrid] = OrderedDict()
+
+    async def get(
+        self,
+        key: Hashable,
+        start: date,
+        end: date,
+        fetch: Fetcher,
+        force: bool = False,
+    ) -> list[dict]:
+        """
+        Return availability for [start, end] for the campground identified by
+        key, refetching via fetch() only the span of that range that has stale
+        days — in at most one call.
+        """
+        grid = self._grid(key)
+        async with grid.lock:
+            stale = self._stale_range(grid, start, end, force)
+            if stale is not None:
+                stale_start, stale_end = stale
+                logger.info(
+                    f"Refreshing {key}: {(stale_end - stale_start).days + 1} of "
+                    f"{(end - start).days + 1} day(s) in 1 request"
+                )
+                sites = await fetch(stale_start, stale_end)
+                self._merge(grid, stale_start, stale_end, sites, time.time())
+
+            return self._snapshot(grid, start, end)
+
+    def _grid(self, key: Hashable) -> CampgroundGrid:
+        grid = self._grids.get(key)
+        if grid is None:
+            grid = self._grids[key] = CampgroundGrid()
+            while len(self._grids) > self.max_campgrounds:
+                self._grids.popitem(last=False)
+        self._grids.move_to_end(key)
+        return grid
+
+    def _stale_range(
+        self, grid: CampgroundGrid, start: date, end: date, force: bool
+    ) -> Optional[tuple[date, date]]:
+        """Span from the first to the last stale day in [start, end], if any."""
+        if force:
+            return start, end
+
+        now = time.time()
+        first: Optional[date] = None
+        last: Optional[date] = None
+
+        day = start
+        while day <= end:
+            if now - grid.refreshed_at.get(day, 0.0) >= MAX_AGE_SECONDS:
+                first = first or day
+                last = day
+            day += timedelta(days=1)
+
+        if first is None:
+            return None
+        return first, last
+
+    def _merge(
+        self, grid: CampgroundGrid, start: date, end: date, sites: list[SiteDays], now: float
+    ) -> None:
+        in_range = lambda d: start <= d <= end
+        seen: set[str] = set()
+
+        for site in sites:
+            seen.add(site.site_id)
+            grid.site_names[site.site_id] = site.site_name
+            held = grid.available.setdefault(site.site_id, set())
+            held.difference_update({d for d in held if in_range(d)})
+            held.update(d for d in site.available_dates if in_range(d))
+
+        # Sites missing from the response have nothing available in this range
+        for site_id, held in grid.available.items():
+            if site_id not in seen:
+                held.difference_update({d for d in held if in_range(d)})
+
+        day = start
+        while day <= end:
+            grid.refreshed_at[day] = now
+            day += timedelta(days=1)
+
+    def _snapshot(self, grid: CampgroundGrid, start: date, end: date) -> list[dict]:
+        results = []
+        for site_id, name in grid.site_names.items():
+            available_dates = sorted(
+                d for d in grid.available.get(site_id, ()) if start <= d <= end
+            )
+            results.append(
+                {
+                    "site_id": site_id,
+                    "site_name": name,
+                    "available": len(available_dates) > 0,
+                    "available_dates": [d.strftime("%Y-%m-%d") for d in available_dates],
+                }
+            )
+        return results
+
+
+availability_grid = IncrementalAvailability()
@@ -10,10 +10,21 @@ The exact endpoints and payload structure follow GoingToCamp's standard pattern
 across all platforms (Ontario Parks, Parks Canada, BC Parks, etc.)
 """
 
+import asyncio
 import httpx
 import logging
-from dataclasses import dataclass
-from typing import Optional
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Optional
+from .http_client import new_client
+from .resilience import (
+    AMBIGUOUS_ERRORS,
+    AMBIGUOUS_STATUS,
+    LatencyTracker,
+    hedged,
+    send_with_retries,
+)
 from .session_manager import SessionInfo
 
 logger = logging.getLogger(__name__)
@@ -25,6 +36,15 @@ RESERVATION_CREATE_ENDPOINT = "/api/reservation/create"
 RESERVATION_CONFIRM_ENDPOINT = "/api/reservation/confirm"
 CART_ADD_ENDPOINT = "/api/cart/add"
 CART_CHECKOUT_ENDPOINT = "/api/cart/checkout"
+CART_REMOVE_ENDPOINT = "/api/cart/remove"
+
+# Per-call latency budgets (seconds), covering all hedges/retries of that call
+AVAILABILITY_BUDGET = 3.0
+CART_BUDGET = 8.0
+CHECKOUT_BUDGET = 15.0
+
+# Observed availability probe latencies per domain; p95 sets the hedge delay
+availability_latency: dict[str, LatencyTracker] = defaultdict(LatencyTracker)
 
 
 @dataclass
@@ -35,6 +55,41 @@ class BookingResult:
     site_name: Optional[str] = None
     confirmation_number: Optional[str] = None
     error: Optional[str] = None
+    # Checkout may or may not have gone through; the account must be checked
+    outcome_unknown: bool = False
+
+
+class CheckoutOutcomeUnknown(Exception):
+    """Checkout failed in a way that doesn't tell us whether it went through."""
+
+
+# Produces a ready-to-use session for one account (fresh login or warm token)
+SessionFactory = Callable[[], Awaitable[SessionInfo]]
+
+
+@dataclass
+class CheckoutClaim:
+    """
+    Shared by the accounts of one fan-out booking. An account must hold the
+    lock to check out, so at most one checkout is ever in flight, and once a
+    checkout confirms, ends with an unknown outcome, or the snipe is stopped,
+    nobody else may start one.
+    """
+
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    stop_reason: Optional[str] = None
+
+    def stop(self, reason: str) -> None:
+        if self.stop_reason is None:
+            self.stop_reason = reason
+
+
+@dataclass
+class FanoutBookingResult:
+    result: BookingResult
+    winning_account: Optional[str] = None
+    elapsed: float = 0.0
+    attempts: dict[str, BookingResult] = field(default_factory=dict)
 
 
 async def execute_booking(
@@ -45,76 +100,163 @@ async def execute_booking(
     departure_date: str,
     equipment_type: str,
     occupants: int,
+    client: Optional[httpx.AsyncClient] = None,
+    claim: Optional[CheckoutClaim] = None,
 ) -> BookingResult:
     """
     Execute a booking on a GoingToCamp platform.
 
     Iterates through site_preferences in order, checking availability
-    and attempting to book the first available site.
+    and attempting to book the first available site. Uses the shared HTTP
+    stack unless a client is passed in (e.g. one on a mock transport).
+
+    With a claim (fan-out booking), the account stops at the next step once
+    the claim is stopped, releasing any cart it holds instead of checking out.
+
+    If a checkout's outcome is unknown (the request may have gone through),
+    no further site is tried and, with a claim, no other account may check
+    out; the result is reported with outcome_unknown set.
     """
+    if client is None:
+        async with new_client() as client:
+            return await _book(
+                client,
+                session,
+                campground_id,
+                site_preferences,
+                arrival_date,
+                departure_date,
+                equipment_type,
+                occupants,
+                claim,
+            )
+
+    return await _book(
+        client,
+        session,
+        campground_id,
+        site_preferences,
+        arrival_date,
+        departure_date,
+        equipment_type,
+        occupants,
+        claim,
+    )
+
+
+async def _book(
+    client: httpx.AsyncClient,
+    session: SessionInfo,
+    campground_id: str,
+    site_preferences: list[str],
+    arrival_date: str,
+    departure_date: str,
+    equipment_type: str,
+    occupants: int,
+    claim: Optional[CheckoutClaim],
+) -> BookingResult:
     domain = session.domain
 
-    async with httpx.AsyncClient(
-        follow_redirects=True,
-        timeout=30.0,
-    ) as client:
-        # Try each preferred site in order
-        for site_id in site_preferences:
-            logger.info(f"Attempting to book site {site_id} at {domain}")
+    # Try each preferred site in order
+    for site_id in site_preferences:
+        if claim is not None and claim.stop_reason:
+            return BookingResult(success=False, error=claim.stop_reason)
 
-            try:
-                # Step 1: Check if site is available right now
-                available = await _check_site_available(
-                    client, session, campground_id, site_id, arrival_date, departure_date
-                )
+        logger.info(f"Attempting to book site {site_id} at {domain}")
 
-                if not available:
-                    logger.info(f"Site {site_id} not available, trying next")
-                    continue
-
-                # Step 2: Create reservation / add to cart
-                cart_result = await _add_to_cart(
-                    client,
-                    session,
-                    campground_id,
-                    site_id,
-                    arrival_date,
-                    departure_date,
-                    equipment_type,
-                    occupants,
-                )
+        try:
+            # Step 1: Check if site is available right now
+            available = await _check_site_available(
+                client, session, campground_id, site_id, arrival_date, departure_date
+            )
 
-                if not cart_result:
-                    logger.warning(f"Failed to add site {site_id} to cart, trying next")
-                    continue
+            if not available:
+                logger.info(f"Site {site_id} not available, trying next")
+                continue
 
-                # Step 3: Checkout / confirm reservation
-                confirmation = await _checkout(client, session)
+            if claim is not None and claim.stop_reason:
+                return BookingResult(success=False, error=claim.stop_reason)
+
+            # Step 2: Create reservation / add to cart
+            cart_result = await _add_to_cart(
+                client,
+                session,
+                campground_id,
+                site_id,
+                arrival_date,
+                departure_date,
+                equipment_type,
+                occupants,
+            )
+
+            if not cart_result:
+                logger.warning(f"Failed to add site {site_id} to cart, trying next")
+                continue
 
-                if confirmation:
-                    logger.info(
-                        f"Booking confirmed! Site {site_id}, "
-                        f"confirmation: {confirmation}"
-                    )
-                    return BookingResult(
-                        success=True,
-                        booking_id=confirmation.get("booking_id"),
-                        site_id=site_id,
-                        confirmation_number=confirmation.get("confirmation_number"),
-                    )
+            # Step 3: Checkout / confirm reservation
+            try:
+                if claim is None:
+                    confirmation = await _checkout(client, session)
                 else:
-                    logger.warning(f"Checkout failed for site {site_id}")
-                    continue
+                    async with claim.lock:
+                        if claim.stop_reason:
+                            released = await _release_cart(
+                                client,
+                                session,
+                                campground_id,
+                                site_id,
+                                arrival_date,
+                                departure_date,
+                            )
+                            return BookingResult(
+                                success=False,
+                                site_id=site_id,
+                                error=(
+                                    f"{claim.stop_reason}; held cart for site {site_id} "
+                                    + ("released" if released else "could not be released")
+                                ),
+                            )
+
+                        try:
+                            confirmation = await _checkout(client, session)
+                        except CheckoutOutcomeUnknown:
+                            claim.stop("Stopped: another account's checkout outcome is unknown")
+                            raise
+                        if confirmation:
+                            claim.stop("Stopped: another account confirmed first")
+            except CheckoutOutcomeUnknown as e:
+                logger.error(f"Checkout outcome unknown for site {site_id}: {e}")
+                return BookingResult(
+                    success=False,
+                    site_id=site_id,
+                    error=f"Checkout outcome unknown for site {site_id}: {e}",
+                    outcome_unknown=True,
+                )
 
-            except Exception as e:
-                logger.exception(f"Error booking site {site_id}")
+            if confirmation:
+                logger.info(
+                    f"Booking confirmed! Site {site_id}, "
+                    f"confirmation: {confirmation}"
+                )
+                return BookingResult(
+                    success=True,
+                    booking_id=confirmation.get("booking_id"),
+                    site_id=site_id,
+                    confirmation_number=confirmation.get("confirmation_number"),
+                )
+            else:
+                logger.warning(f"Checkout failed for site {site_id}")
                 continue
 
-        # All preferred sites exhausted
-        return BookingResult(
-            success=False,
-            error="No preferred sites were available at the time of booking",
-        )
+        except Exception as e:
+            logger.exception(f"Error booking site {site_id}")
+            continue
+
+    # All preferred sites exhausted
+    return BookingResult(
+        success=False,
+        error="No preferred sites were available at the time of booking",
+    )
 
 
 async def _check_site_available(
@@ -125,20 +267,43 @@ async def _check_site_available(
     arrival_date: str,
     departure_date: str,
 ) -> bool:
-    """Check if a specific site is available for the given dates."""
+    """
+    Check if a specific site is available for the given dates.
+
+    The probe is read-only, so a duplicate is hedged in if the first hasn't
+    answered within the domain's observed p95 latency. Probes and hedge
+    together must finish within AVAILABILITY_BUDGET.
+    """
     url = f"https://{session.domain}{AVAILABILITY_ENDPOINT}"
+    latency = availability_latency[session.domain]
+
+    async def probe(timeout: float) -> httpx.Response:
+        started = time.monotonic()
+        try:
+            response = await client.post(
+                url,
+                json={
+                    "mapId": int(campground_id),
+                    "resourceLocationId": int(site_id),
+                    "startDate": arrival_date,
+                    "endDate": departure_date,
+                },
+                headers=session.headers,
+                timeout=timeout,
+            )
+        except httpx.TimeoutException:
+            # Timeouts count at their full duration so they pull the p95 up
+            latency.record(time.monotonic() - started)
+            raise
+        latency.record(time.monotonic() - started)
+        return response
 
     try:
-        response = await client.post(
-            url,
-            json={
-                "mapId": int(campground_id),
-                "resourceLocationId": int(site_id),
-                "startDate": arrival_date,
-                "endDate": departure_date,
-            },
-            headers=session.headers,
-        )
+        try:
+            response = await hedged(probe, latency.hedge_delay(), AVAILABILITY_BUDGET)
+        except asyncio.TimeoutError:
+            latency.record(AVAILABILITY_BUDGET)
+            raise
 
         if response.status_code != 200:
             return False
@@ -181,22 +346,34 @@ async def _add_to_cart(
     equipment_type: str,
     occupants: int,
 ) -> Optional[dict]:
-    """Add a campsite reservation to the cart."""
+    """
+    Add a campsite reservation to the cart.
+
+    A retried add after an ambiguous failure (read timeout, 502/504) could
+    create a second cart line that checkout would then buy. Like checkout, it
+    is only retried when the request provably never reached the server or
+    upstream asked for a retry.
+    """
     url = f"https://{session.domain}{CART_ADD_ENDPOINT}"
 
     try:
-        response = await client.post(
-            url,
-            json={
-                "mapId": int(campground_id),
-                "resourceLocationId": int(site_id),
-                "startDate": arrival_date,
-                "endDate": departure_date,
-                "equipmentType": equipment_type,
-                "partySize": occupants,
-                "isReserving": True,
-            },
-            headers=session.headers,
+        response = await send_with_retries(
+            lambda timeout: client.post(
+                url,
+                json={
+                    "mapId": int(campground_id),
+                    "resourceLocationId": int(site_id),
+                    "startDate": arrival_date,
+                    "endDate": departure_date,
+                    "equipmentType": equipment_type,
+                    "partySize": occupants,
+                    "isReserving": True,
+                },
+                headers=session.headers,
+                timeout=timeout,
+            ),
+            latency_budget=CART_BUDGET,
+            idempotent=False,
         )
 
         if response.status_code in (200, 201):
@@ -216,30 +393,210 @@ async def _checkout(
     client: httpx.AsyncClient,
     session: SessionInfo,
 ) -> Optional[dict]:
-    """Complete the checkout and confirm the reservation."""
+    """
+    Complete the checkout and confirm the reservation.
+
+    Checkout may charge the account, so it is only retried when the request
+    provably never reached the server or upstream asked us to retry. Returns
+    None if checkout definitely failed, and raises CheckoutOutcomeUnknown if
+    it may have gone through (read timeout, dropped connection, 502/504).
+    """
     url = f"https://{session.domain}{CART_CHECKOUT_ENDPOINT}"
 
     try:
-        response = await client.post(
-            url,
-            json={},
-            headers=session.headers,
+        response = await send_with_retries(
+            lambda timeout: client.post(url, json={}, headers=session.headers, timeout=timeout),
+            latency_budget=CHECKOUT_BUDGET,
+            idempotent=False,
         )
+    except AMBIGUOUS_ERRORS as e:
+        raise CheckoutOutcomeUnknown(f"{type(e).__name__}: {e}") from e
+    except Exception as e:
+        logger.warning(f"Checkout error: {e}")
+        return None
 
-        if response.status_code in (200, 201):
+    if response.status_code in AMBIGUOUS_STATUS:
+        raise CheckoutOutcomeUnknown(f"upstream returned {response.status_code}")
+
+    if response.status_code in (200, 201):
+        try:
             data = response.json()
-            return {
-                "booking_id": data.get("reservationId", data.get("bookingId")),
-                "confirmation_number": data.get(
-                    "confirmationNumber", data.get("confirmation")
-                ),
-            }
+        except ValueError as e:
+            raise CheckoutOutcomeUnknown(f"unreadable confirmation: {e}") from e
+        return {
+            "booking_id": data.get("reservationId", data.get("bookingId")),
+            "confirmation_number": data.get(
+                "confirmationNumber", data.get("confirmation")
+            ),
+        }
+
+    logger.warning(
+        f"Checkout failed: {response.status_code} - {response.text[:300]}"
+    )
+    return None
+
+
+async def _release_cart(
+    client: httpx.AsyncClient,
+    session: SessionInfo,
+    campground_id: str,
+    site_id: str,
+    arrival_date: str,
+    departure_date: str,
+) -> bool:
+    """Best-effort removal of a held site from the cart."""
+    url = f"https://{session.domain}{CART_REMOVE_ENDPOINT}"
+
+    try:
+        response = await send_with_retries(
+            lambda timeout: client.post(
+                url,
+                json={
+                    "mapId": int(campground_id),
+                    "resourceLocationId": int(site_id),
+                    "startDate": arrival_date,
+                    "endDate": departure_date,
+                },
+                headers=session.headers,
+                timeout=timeout,
+            ),
+            latency_budget=CART_BUDGET,
+            idempotent=True,
+        )
+        if response.status_code in (200, 204):
+            return True
 
         logger.warning(
-            f"Checkout failed: {response.status_code} - {response.text[:300]}"
+            f"Cart release failed: {response.status_code} - {response.text[:300]}"
         )
-        return None
+        return False
 
     except Exception as e:
-        logger.warning(f"Checkout error: {e}")
-        return None
+        logger.warning(f"Cart release error: {e}")
+        return False
+
+
+async def execute_fanout_booking(
+    session_factories: dict[str, SessionFactory],
+    campground_id: str,
+    site_preferences: list[str],
+    arrival_date: str,
+    departure_date: str,
+    equipment_type: str,
+    occupants: int,
+    disjoint: bool = False,
+    latency_budget: Optional[float] = None,
+) -> FanoutBookingResult:
+    """
+    Race several accounts at the same snipe and keep the first confirmation.
+
+    Each account logs in and runs the normal availability → cart → checkout
+    flow concurrently. With disjoint=True the preference list is dealt out
+    round-robin so accounts never compete for the same site; otherwise every
+    account tries the full list.
+
+    Accounts share a CheckoutClaim: checkouts run one at a time, and once one
+    confirms, the others stop at their next step and release any held cart.
+    A checkout whose outcome is unknown stops the others the same way, since
+    it may have booked; that account is reported with outcome_unknown set.
+    latency_budget (seconds) bounds login outright: logging in has no side
+    effects, so a login still running when the budget runs out is abandoned.
+    Cart and checkout are never cancelled mid-request — once the budget
+    elapses the claim is stopped and in-flight steps are allowed to finish
+    (each within its own per-call budget), so every reported outcome is the
+    real one (a checkout already under way when the budget ran out may still
+    win).
+    """
+    started = time.monotonic()
+    deadline = started + latency_budget if latency_budget else None
+    labels = list(session_factories)
+    claim = CheckoutClaim()
+
+    if disjoint:
+        assignments = {
+            label: site_preferences[i :: len(labels)] for i, label in enumerate(labels)
+        }
+    else:
+        assignments = {label: site_preferences for label in labels}
+
+    async def run(label: str) -> BookingResult:
+        try:
+            login = session_factories[label]()
+            if deadline is None:
+                session = await login
+            else:
+                try:
+                    session = await asyncio.wait_for(
+                        login, timeout=max(0.0, deadline - time.monotonic())
+                    )
+                except asyncio.TimeoutError:
+                    return BookingResult(
+                        success=False, error="Stopped: latency budget exceeded during login"
+                    )
+            if claim.stop_reason:
+                return BookingResult(success=False, error=claim.stop_reason)
+            return await execute_booking(
+                session=session,
+                campground_id=campground_id,
+                site_preferences=assignments[label],
+                arrival_date=arrival_date,
+                departure_date=departure_date,
+                equipment_type=equipment_type,
+                occupants=occupants,
+                claim=claim,
+            )
+        except Exception as e:
+            logger.warning(f"Fan-out booking failed for account {label}: {e}")
+            return BookingResult(success=False, error=str(e))
+
+    tasks = {
+        asyncio.create_task(run(label)): label for label in labels if assignments[label]
+    }
+    budget_exceeded = False
+    if tasks:
+        _, pending = await asyncio.wait(tasks, timeout=latency_budget)
+        if pending:
+            budget_exceeded = True
+            claim.stop("Stopped: latency budget exceeded")
+            await asyncio.wait(pending)
+
+    attempts = {label: task.result() for task, label in tasks.items()}
+    winner = next((label for label, result in attempts.items() if result.success), None)
+    elapsed = time.monotonic() - started
+
+    if winner:
+        logger.info(f"Fan-out booking won by account {winner} in {elapsed * 1000:.0f}ms")
+        return FanoutBookingResult(
+            result=attempts[winner],
+            winning_account=winner,
+            elapsed=elapsed,
+            attempts=attempts,
+        )
+
+    unknown = [label for label, result in attempts.items() if result.outcome_unknown]
+    if unknown:
+        logger.error(f"Fan-out booking outcome unknown for account(s) {', '.join(unknown)}")
+        return FanoutBookingResult(
+            result=BookingResult(
+                success=False,
+                site_id=attempts[unknown[0]].site_id,
+                error=(
+                    f"Checkout outcome unknown for account(s) {', '.join(unknown)}; "
+                    "check the account before booking again"
+                ),
+                outcome_unknown=True,
+            ),
+            elapsed=elapsed,
+            attempts=attempts,
+        )
+
+    if budget_exceeded:
+        error = f"Latency budget of {latency_budget * 1000:.0f}ms exceeded before any account confirmed"
+    else:
+        error = "No account could book any of the preferred sites"
+
+    return FanoutBookingResult(
+        result=BookingResult(success=False, error=error),
+        elapsed=elapsed,
+        attempts=attempts,
+    )
@@ -0,0 +1,178 @@
+"""
+Native async availability client for GoingToCamp platforms.
+
+Talks to the same endpoints camply's GoingToCampProvider uses, but
+asynchronously over the shared HTTP stack, and decodes the availability grid
+straight into SiteDays records without building per-site camply objects.
+
+  GET /api/maps                          — map tree (cached per domain)
+  GET /api/resourcelocation/resources    — site names (cached per campground)
+  GET /api/availability/map              — daily availability per leaf map
+"""
+
+import asyncio
+import logging
+from datetime import date, timedelta
+from typing import Optional
+
+import httpx
+import orjson
+
+from .availability_state import SiteDays
+from .booking_executor import AVAILABILITY_ENDPOINT
+from .http_client import BROWSER_USER_AGENT, new_client
+from .ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+MAPS_ENDPOINT = "/api/maps"
+RESOURCES_ENDPOINT = "/api/resourcelocation/resources"
+
+# GoingToCamp availability codes: 0 = available, anything else is not
+AVAILABLE = 0
+# camply's default equipment category ("any non-group equipment")
+NON_GROUP_EQUIPMENT = -32768
+
+# Map trees and site names change between seasons, not between scans
+METADATA_TTL_SECONDS = 6 * 3600.0
+MAX_MAP_DOMAINS = 64
+MAX_SITE_NAME_CAMPGROUNDS = 1024
+
+
+class NoSiteMapsError(LookupError):
+    """The campground has no site-bearing maps in the domain's map tree."""
+
+
+_maps: TTLCache[list[dict]] = TTLCache(ttl=METADATA_TTL_SECONDS, max_entries=MAX_MAP_DOMAINS)
+_site_names: TTLCache[dict[str, str]] = TTLCache(
+    ttl=METADATA_TTL_SECONDS, max_entries=MAX_SITE_NAME_CAMPGROUNDS
+)
+
+
+async def get_site_availability(
+    domain: str,
+    campground_id: int,
+    start_date: date,
+    end_date: date,
+    client: Optional[httpx.AsyncClient] = None,
+) -> list[SiteDays]:
+    """
+    Daily availability for every site in a campground over [start_date, end_date].
+
+    Raises NoSiteMapsError if no map in the tree belongs to the campground
+    (wrong ID, or a tree shape this client doesn't understand) rather than
+    reporting it as having no availability.
+    """
+    if client is None:
+        async with new_client(headers=_headers(domain)) as client:
+            return await get_site_availability(
+                domain, campground_id, start_date, end_date, client=client
+            )
+
+    map_ids, names = await asyncio.gather(
+        _leaf_map_ids(client, domain, campground_id),
+        _campground_site_names(client, domain, campground_id),
+    )
+    if not map_ids:
+        raise NoSiteMapsError(
+            f"No site maps for campground {campground_id} in the {domain} map tree"
+        )
+    grids = await asyncio.gather(
+        *(_map_availability(client, domain, map_id, start_date, end_date) for map_id in map_ids)
+    )
+
+    sites: dict[str, SiteDays] = {}
+    for grid in grids:
+        for resource_id, days in grid.get("resourceAvailabilities", {}).items():
+            site = sites.get(resource_id)
+            if site is None:
+                site = sites[resource_id] = SiteDays(
+                    site_id=resource_id,
+                    site_name=names.get(resource_id, resource_id),
+                    available_dates=[],
+                )
+            for offset, day in enumerate(days):
+                if day.get("availability") == AVAILABLE:
+                    available_on = start_date + timedelta(days=offset)
+                    if available_on <= end_date:
+                        site.available_dates.append(available_on)
+
+    return list(sites.values())
+
+
+def _headers(domain: str) -> dict:
+    return {
+        "User-Agent": BROWSER_USER_AGENT,
+        "Accept": "application/json",
+        "Referer": f"https://{domain}/",
+    }
+
+
+async def _get_json(client: httpx.AsyncClient, url: str, params: Optional[dict] = None):
+    response = await client.get(url, params=params)
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+async def _leaf_map_ids(client: httpx.AsyncClient, domain: str, campground_id: int) -> list[int]:
+    """
+    Maps belonging to the campground that directly contain sites. A cached
+    tree with no match is refetched once, in case the campground is new.
+    """
+    maps = _maps.get(domain)
+    cached = maps is not None
+    while True:
+        if maps is None:
+            maps = _maps.put(domain, await _get_json(client, f"https://{domain}{MAPS_ENDPOINT}"))
+
+        map_ids = [
+            m["mapId"]
+            for m in maps
+            if m.get("resourceLocationId") == campground_id and m.get("mapResources")
+        ]
+        if map_ids or not cached:
+            return map_ids
+        maps, cached = None, False
+
+
+async def _campground_site_names(
+    client: httpx.AsyncClient, domain: str, campground_id: int
+) -> dict[str, str]:
+    key = (domain, campground_id)
+    names = _site_names.get(key)
+    if names is None:
+        resources = await _get_json(
+            client,
+            f"https://{domain}{RESOURCES_ENDPOINT}",
+            params={"resourceLocationId": campground_id},
+        )
+        names = _site_names.put(
+            key,
+            {
+                str(r["resourceId"]): (r.get("localizedValues") or [{}])[0].get(
+                    "name", str(r["resourceId"])
+                )
+                for r in resources
+            },
+        )
+    return names
+
+
+async def _map_availability(
+    client: httpx.AsyncClient, domain: str, map_id: int, start_date: date, end_date: date
+) -> dict:
+    return await _get_json(
+        client,
+        f"https://{domain}{AVAILABILITY_ENDPOINT}",
+        params={
+            "mapId": map_id,
+            "bookingCategoryId": 0,
+            "equipmentCategoryId": NON_GROUP_EQUIPMENT,
+            "startDate": start_date.isoformat(),
+            "endDate": end_date.isoformat(),
+            "getDailyAvailability": "true",
+            "isReserving": "true",
+            "partySize": 1,
+            "numEquipment": 1,
+        },
+    )
@@ -0,0 +1,58 @@
+"""
+Shared HTTP stack for direct GoingToCamp calls.
+
+All direct upstream traffic (booking, availability) goes through one pooled
+transport so TLS connections opened by one call are reused by the next — a
+snipe doesn't pay a fresh handshake if the scanner already talked to that
+domain. Each caller still gets its own lightweight AsyncClient, and with it its
+own cookie jar, so accounts never see each other's session cookies. Those
+clients are opened and closed per logical session as usual; closing one
+leaves the shared pool alone.
+"""
+
+from typing import Optional
+
+import httpx
+
+BROWSER_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+_transport: Optional[httpx.AsyncHTTPTransport] = None
+
+
+class _BorrowedTransport(httpx.AsyncBaseTransport):
+    """Delegates to the shared pool; closing a client that uses it is a no-op."""
+
+    def __init__(self, pool: httpx.AsyncHTTPTransport):
+        self._pool = pool
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._pool.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pass
+
+
+def shared_transport() -> httpx.AsyncHTTPTransport:
+    global _transport
+    if _transport is None:
+        _transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        )
+    return _transport
+
+
+def new_client(**kwargs) -> httpx.AsyncClient:
+    """
+    AsyncClient on the shared pool, for one logical session. Use it as an
+    async context manager; closing it does not close the pool.
+    """
+    kwargs.setdefault("follow_redirects", True)
+    kwargs.setdefault("timeout", 30.0)
+    return httpx.AsyncClient(transport=_BorrowedTransport(shared_transport()), **kwargs)
+
+
+async def close_shared_transport() -> None:
+    global _transport
+    if _transport is not None:
+        await _transport.aclose()
+        _transport = None
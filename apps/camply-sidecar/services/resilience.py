@@ -0,0 +1,228 @@
+"""
+Latency-bounded hedging and retries for booking-critical HTTP calls.
+
+- hedged(): if a read-only call hasn't answered within a p95-derived delay,
+  fire one duplicate and take whichever answers first, all inside one
+  overall latency budget.
+- send_with_retries(): retry transient failures with jittered exponential
+  backoff, but only when it is safe. Connection-phase errors are always
+  retried. For calls the caller marks idempotent, so are 429/5xx gateway
+  statuses and ambiguous mid-flight failures. Non-idempotent calls are only
+  retried on a 429/503 carrying Retry-After, where upstream has said it
+  didn't process the request; a 502/504 may have reached the origin, so it is
+  ambiguous and returned as-is.
+
+Both draw from a shared RetryBudget so extra attempts stay a small fraction of
+total traffic and a degraded upstream isn't hammered into rate limiting.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = frozenset({429, 502, 503, 504})
+
+# Upstream declined the request; with Retry-After it is safe to resend even
+# when the call isn't idempotent
+DECLINED_STATUS = frozenset({429, 503})
+
+# A gateway gave up waiting; the origin may or may not have processed it
+AMBIGUOUS_STATUS = frozenset({502, 504})
+
+# The request never reached the server, so resending cannot duplicate it
+SAFE_TO_RETRY_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+# The server may or may not have processed the request
+AMBIGUOUS_ERRORS = (
+    httpx.ReadTimeout,
+    httpx.ReadError,
+    httpx.WriteTimeout,
+    httpx.WriteError,
+    httpx.RemoteProtocolError,
+)
+
+
+class LatencyTracker:
+    """Rolling window of call latencies used to pick a hedge delay."""
+
+    def __init__(
+        self,
+        window: int = 200,
+        min_samples: int = 20,
+        default: float = 0.5,
+        floor: float = 0.05,
+        ceiling: float = 2.0,
+    ):
+        self.samples: deque[float] = deque(maxlen=window)
+        self.min_samples = min_samples
+        self.default = default
+        self.floor = floor
+        self.ceiling = ceiling
+
+    def record(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def p95(self) -> float:
+        if len(self.samples) < self.min_samples:
+            return self.default
+        ordered = sorted(self.samples)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+    def hedge_delay(self) -> float:
+        return min(self.ceiling, max(self.floor, self.p95()))
+
+
+class RetryBudget:
+    """
+    Token bucket capping retries and hedges to roughly `ratio` of requests.
+    Each original request deposits `ratio` tokens; each extra attempt costs one.
+    """
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 10.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def deposit(self) -> None:
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.tokens >= 1.0:
+            self.tokens -= 1.0
+            return True
+        return False
+
+
+retry_budget = RetryBudget()
+
+
+async def hedged(
+    call: Callable[[float], Awaitable[T]],
+    delay: float,
+    latency_budget: float,
+    budget: RetryBudget = retry_budget,
+) -> T:
+    """
+    Run call(timeout); if it hasn't succeeded within `delay` seconds, start one
+    duplicate and return the first successful result. Only for read-only calls.
+
+    The whole operation is bounded by latency_budget: each call is given the
+    time left in it as its timeout, and asyncio.TimeoutError is raised if
+    nothing has succeeded by then.
+    """
+    budget.deposit()
+    deadline = time.monotonic() + latency_budget
+    remaining = lambda: max(0.0, deadline - time.monotonic())
+
+    first = asyncio.create_task(call(latency_budget))
+    pending = {first}
+    error: Optional[BaseException] = None
+    try:
+        done, pending = await asyncio.wait(pending, timeout=min(delay, latency_budget))
+        if done and first.exception() is None:
+            return first.result()
+
+        if remaining() > 0 and budget.withdraw():
+            logger.info(f"Hedging request after {delay * 1000:.0f}ms")
+            pending.add(asyncio.create_task(call(remaining())))
+        elif done:
+            return first.result()
+
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, timeout=remaining(), return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                raise asyncio.TimeoutError(
+                    f"No response within {latency_budget * 1000:.0f}ms budget"
+                )
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def send_with_retries(
+    send: Callable[[float], Awaitable[httpx.Response]],
+    latency_budget: float,
+    idempotent: bool,
+    budget: RetryBudget = retry_budget,
+    max_attempts: int = 3,
+    base_delay: float = 0.1,
+    max_delay: float = 1.0,
+) -> httpx.Response:
+    """
+    Call send(timeout) until it returns a non-retryable response, the attempts
+    or latency budget run out, or the retry budget is exhausted. `timeout` is
+    the time left in the latency budget. Raises the last error if no response
+    was ever received.
+
+    For non-idempotent calls, an ambiguous error is raised immediately and an
+    AMBIGUOUS_STATUS response is returned immediately, so callers can tell
+    "may have happened" apart from "didn't happen".
+    """
+    budget.deposit()
+    deadline = time.monotonic() + latency_budget
+    attempt = 0
+
+    while True:
+        attempt += 1
+        response: Optional[httpx.Response] = None
+        error: Optional[Exception] = None
+        retry_after: Optional[float] = None
+
+        try:
+            response = await send(max(0.0, deadline - time.monotonic()))
+            if response.status_code not in RETRYABLE_STATUS:
+                return response
+            retry_after = _retry_after(response)
+            if not idempotent and (
+                response.status_code not in DECLINED_STATUS or retry_after is None
+            ):
+                return response
+        except SAFE_TO_RETRY_ERRORS as e:
+            error = e
+        except AMBIGUOUS_ERRORS as e:
+            if not idempotent:
+                raise
+            error = e
+
+        # Full jitter: uniform over [0, capped exponential]
+        delay = retry_after
+        if delay is None:
+            delay = random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
+
+        if (
+            attempt >= max_attempts
+            or time.monotonic() + delay >= deadline
+            or not budget.withdraw()
+        ):
+            if error is not None:
+                raise error
+            return response
+
+        logger.info(
+            f"Retrying after {error or response.status_code} "
+            f"(attempt {attempt + 1}/{max_attempts}) in {delay * 1000:.0f}ms"
+        )
+        await asyncio.sleep(delay)
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    try:
+        return float(response.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
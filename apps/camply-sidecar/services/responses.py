@@ -0,0 +1,94 @@
+"""
+Response layer for the sidecar — orjson encoding, pre-serialised payloads, ETags.
+
+Route handlers return plain dicts; by default those are encoded with orjson via
+ORJSONResponse instead of FastAPI's jsonable_encoder + stdlib json. Large,
+slow-changing payloads (the campground catalogue) are encoded once and held as
+bytes in a PayloadCache, so repeat requests skip both the upstream camply call
+and the encoding step. Every payload carries a strong ETag derived from its
+bytes, and requests whose If-None-Match matches get a bodyless 304.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from typing import Any, Hashable, Optional
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+from .ttl_cache import TTLCache
+
+JSON_MEDIA_TYPE = "application/json"
+
+# Catalogue data (park/campground listings) changes a few times a season.
+CATALOGUE_TTL_SECONDS = 3600.0
+CATALOGUE_MAX_ENTRIES = 256
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse that encodes with orjson (handles dates, dataclasses natively)."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@dataclass
+class CachedPayload:
+    body: bytes
+    etag: str
+    # Caller-defined data kept alongside the bytes (e.g. a search index)
+    attachment: Any = None
+
+
+def encode_payload(content: Any) -> CachedPayload:
+    """Serialise content once with orjson and tag it with a content-derived ETag."""
+    body = orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+    return CachedPayload(body=body, etag=f'"{digest}"')
+
+
+def payload_response(request: Request, payload: CachedPayload) -> Response:
+    """
+    Serve pre-encoded bytes directly, or a 304 if the client already has them.
+    """
+    headers = {"ETag": payload.etag}
+    if _etag_matches(request.headers.get("if-none-match"), payload.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=payload.body, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison per RFC 9110 §13.1.2 — W/ prefixes are ignored."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class PayloadCache:
+    """TTLCache of encoded payloads: content is serialised once, on put()."""
+
+    def __init__(self, ttl: float, max_entries: int):
+        self._payloads: TTLCache[CachedPayload] = TTLCache(ttl, max_entries)
+
+    def get(self, key: Hashable) -> Optional[CachedPayload]:
+        return self._payloads.get(key)
+
+    def put(self, key: Hashable, content: Any, attachment: Any = None) -> CachedPayload:
+        payload = encode_payload(content)
+        payload.attachment = attachment
+        return self._payloads.put(key, payload)
+
+    def clear(self) -> None:
+        self._payloads.clear()
+
+
+catalogue_cache = PayloadCache(ttl=CATALOGUE_TTL_SECONDS, max_entries=CATALOGUE_MAX_ENTRIES)
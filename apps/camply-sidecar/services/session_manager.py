@@ -16,6 +16,11 @@ logger = logging.getLogger(__name__)
 AUTH_ENDPOINT = "/api/authenticate"
 VALIDATE_ENDPOINT = "/api/authenticate/validate"
 
+# What a session token handed back by /book/login is
+SESSION_KIND_BEARER = "bearer"
+SESSION_KIND_COOKIE = "cookie"
+SESSION_KINDS = (SESSION_KIND_BEARER, SESSION_KIND_COOKIE)
+
 
 @dataclass
 class SessionInfo:
@@ -90,6 +95,38 @@ async def authenticate(
         return session
 
 
+def session_kind(session: SessionInfo) -> str:
+    """Kind of the token /book/login returns for this session."""
+    return SESSION_KIND_BEARER if session.auth_token else SESSION_KIND_COOKIE
+
+
+def session_from_token(domain: str, session_token: str, kind: str) -> SessionInfo:
+    """
+    Rebuild a SessionInfo from a token previously returned by /book/login,
+    using the session_kind login reported alongside it.
+    """
+    if kind not in SESSION_KINDS:
+        raise ValueError(f"Unknown session kind: {kind}")
+    is_cookie = kind == SESSION_KIND_COOKIE
+    session = SessionInfo(
+        domain=domain,
+        session_cookie=session_token if is_cookie else "",
+        auth_token="" if is_cookie else session_token,
+        headers={
+            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+            "Origin": f"https://{domain}",
+            "Referer": f"https://{domain}/",
+        },
+    )
+
+    if is_cookie:
+        session.headers["Cookie"] = session_token
+    else:
+        session.headers["Authorization"] = f"Bearer {session_token}"
+
+    return session
+
+
 async def validate_session(session: SessionInfo) -> bool:
     """Check if an existing session is still valid."""
     url = f"https://{session.domain}{VALIDATE_ENDPOINT}"